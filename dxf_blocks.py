@@ -0,0 +1,136 @@
+import itertools
+import numpy as np
+import ezdxf
+from ezdxf import bbox
+from ezdxf.math import Vec3
+
+def block_statistics(dxf_doc, block_name, cache):
+    """Returns the effective entity counts and local extents of a block definition.
+
+    Every block is analyzed only once, the result is stored in cache and
+    reused for all INSERT entities referencing the block.
+
+    Args:
+        dxf_doc: The DXF document object.
+        block_name: Name of the block definition.
+        cache (dict): Block name to (counts, extents) of the analyzed blocks.
+
+    Returns:
+        A tuple (counts, extents), counts maps the entity type to the number
+        of entities after expanding all nested INSERTs, extents is a 2x3 numpy
+        array [extmin, extmax] in block coordinates or None for empty blocks.
+    """
+    if block_name in cache:
+        # None marks a block in progress, a circular reference adds nothing
+        return cache[block_name] or ({}, None)
+
+    block = dxf_doc.blocks.get(block_name)
+    if block is None:
+        return {}, None
+
+    cache[block_name] = None
+    cache[block_name] = entity_statistics(dxf_doc, block, cache)
+    return cache[block_name]
+
+def entity_statistics(dxf_doc, entities, cache):
+    """Returns the effective entity counts and extents of a collection of entities.
+
+    INSERT entities are not counted themselves, they are replaced by the
+    content of the referenced block, including all array instances.
+    """
+    counts = {}
+    primitives = []
+    inserts = {}
+    for entity in entities:
+        dxftype = entity.dxftype()
+        if dxftype == 'INSERT':
+            inserts.setdefault(entity.dxf.name, []).append(entity)
+        else:
+            counts[dxftype] = counts.get(dxftype, 0) + 1
+            primitives.append(entity)
+
+    extents = []
+    box = bbox.extents(primitives, fast=True)
+    if box.has_data:
+        extents.append(np.array([box.extmin, box.extmax], dtype=float))
+
+    for block_name, block_inserts in inserts.items():
+        block_counts, block_extents = block_statistics(dxf_doc, block_name, cache)
+        matrices = insert_matrices(block_inserts)
+        for dxftype, count in block_counts.items():
+            counts[dxftype] = counts.get(dxftype, 0) + count * len(matrices)
+        if block_extents is not None:
+            extents.append(transform_extents(block_extents, matrices))
+
+    if not extents:
+        return counts, None
+    points = np.concatenate(extents)
+    return counts, np.array([points.min(axis=0), points.max(axis=0)])
+
+def insert_matrices(inserts):
+    """Returns the block to parent transformation of every INSERT instance.
+
+    Array inserts (row_count/column_count) contribute one matrix per instance.
+
+    Returns:
+        A numpy array of shape (n, 4, 4), row vector convention like Matrix44.
+    """
+    matrices = []
+    for insert in inserts:
+        matrix = np.array(list(insert.matrix44()), dtype=float).reshape(4, 4)
+        columns = max(insert.dxf.column_count, 1)
+        rows = max(insert.dxf.row_count, 1)
+        if columns * rows == 1:
+            matrices.append(matrix[np.newaxis])
+            continue
+
+        # Array offsets are defined in the OCS, rotated by the insert rotation
+        grid = np.indices((columns, rows)).reshape(2, -1).T
+        offsets = grid * (insert.dxf.column_spacing, insert.dxf.row_spacing)
+        angle = np.radians(insert.dxf.rotation)
+        rotation = np.array([[np.cos(angle), np.sin(angle)], [-np.sin(angle), np.cos(angle)]])
+        ocs = insert.ocs()
+        to_wcs = np.array([ocs.ux, ocs.uy], dtype=float)
+
+        instances = np.repeat(matrix[np.newaxis], len(offsets), axis=0)
+        instances[:, 3, :3] += offsets @ rotation @ to_wcs
+        matrices.append(instances)
+    return np.concatenate(matrices)
+
+def transform_extents(extents, matrices):
+    """Returns the extents of a bounding box transformed by all matrices at once."""
+    corners = np.array([(*corner, 1.0) for corner in itertools.product(*extents.T)])
+    points = np.einsum('ij,njk->nik', corners, matrices)[..., :3].reshape(-1, 3)
+    return np.array([points.min(axis=0), points.max(axis=0)])
+
+def layout_statistics(dxf_doc, cache=None):
+    """Returns the effective entity counts and extents of all layouts.
+
+    Args:
+        dxf_doc: The DXF document object.
+        cache (dict): Optional block cache shared with other analysis calls.
+
+    Returns:
+        Dict layout name to (counts, extents), see block_statistics.
+    """
+    if cache is None:
+        cache = {}
+    # Layouts are stored as blocks, their results are shared with block_statistics
+    return {layout.name: block_statistics(dxf_doc, layout.block_record_name, cache) for layout in dxf_doc.layouts}
+
+def format_extents(extents):
+    if extents is None:
+        return "N/A"
+    return f"{Vec3(extents[0])} - {Vec3(extents[1])}"
+
+def list_effective(dxf_doc, cache=None):
+    print("\nEffective Entities (Blocks Expanded):")
+    for name, (counts, extents) in layout_statistics(dxf_doc, cache).items():
+        print(f"  Layout Name: {name}, Entities: {sum(counts.values())}, Extents: {format_extents(extents)}")
+        for dxftype, count in sorted(counts.items()):
+            print(f"    Entity Type: {dxftype}, Count: {count}")
+
+if __name__ == "__main__":
+    path = "/Users/smg/Documents/Programming/Code/python/sampledxf/others/now4.dxf"  # Replace with your DXF file path
+
+    list_effective(ezdxf.readfile(path))
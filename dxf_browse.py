@@ -1,6 +1,7 @@
 import os
 import time
 import ezdxf
+import dxf_blocks
 
 def process_path(*paths):
     """Processes one or multiple DXF files, or all DXF files in a folder.
@@ -65,7 +66,8 @@ def display_details(dxf_doc):
     list_doc(dxf_doc)
     list_headers(dxf_doc, max=10)
     list_layers(dxf_doc)
-    list_blocks(dxf_doc, max=10)
+    block_cache = {}
+    list_blocks(dxf_doc, max=10, block_cache=block_cache)
     list_modelspace(dxf_doc, max=10)
     list_layouts(dxf_doc)
     list_viewports(dxf_doc)
@@ -74,7 +76,8 @@ def display_details(dxf_doc):
     color_distribution(dxf_doc)
     list_annotations(dxf_doc)
     list_others(dxf_doc)
-    list_summary(dxf_doc, class_count)
+    dxf_blocks.list_effective(dxf_doc, block_cache)
+    list_summary(dxf_doc, class_count, block_cache)
 
 def list_doc(dxf_doc):
     print("\ndxf Details:")
@@ -109,10 +112,19 @@ def list_layers(dxf_doc):
     for layer in dxf_doc.layers:
         print(f"  Layer Name: {layer.dxf.name}, Color: {layer.dxf.color}, Linetype: {layer.dxf.linetype}")
 
-def list_blocks(dxf_doc, max=10):
+def list_blocks(dxf_doc, max=10, block_cache=None):
+    """Prints the block definitions with their direct and effective entity counts.
+    Args:
+        dxf_doc: The DXF document object.
+        block_cache (dict): Optional cache of dxf_blocks.block_statistics results.
+    """
+    if block_cache is None:
+        block_cache = {}
     print("\nBlocks:")
     for block in dxf_doc.blocks:
-        print(f"  Block Name: {block.name}, Entities: {len(block)}")
+        counts, extents = dxf_blocks.block_statistics(dxf_doc, block.name, block_cache)
+        print(f"  Block Name: {block.name}, Entities: {len(block)}, "
+              f"Effective Entities: {sum(counts.values())}, Extents: {dxf_blocks.format_extents(extents)}")
 
         if(len(block) < max):
             for entity in block:
@@ -247,12 +259,15 @@ def list_others(dxf_doc):
     for dimstyle in dxf_doc.dimstyles:
         print(f"  DimStyle Name: {dimstyle.dxf.name}, DimScale: {dimstyle.dxf.dimasz}")
 
-def list_summary(dxf_doc, class_count):
+def list_summary(dxf_doc, class_count, block_cache=None):
+    counts, extents = dxf_blocks.block_statistics(dxf_doc, dxf_doc.modelspace().block_record_name, {} if block_cache is None else block_cache)
     print("\nSummary:")
     print(f"  Total Header variables: {len(dxf_doc.header.varnames())}")
     print(f"  Total Layers: {len(dxf_doc.layers)}")
     print(f"  Total Blocks: {len(dxf_doc.blocks)}")
     print(f"  Total Modelspace: {len(list(dxf_doc.modelspace()))}")
+    print(f"  Total Effective Modelspace: {sum(counts.values())}")
+    print(f"  Modelspace Extents: {dxf_blocks.format_extents(extents)}")
     print(f"  Total Layouts: {len(dxf_doc.layouts) - 1}")  # Exclude modelspace
     print(f"  Total Viewports: {len(dxf_doc.viewports)}")
     print(f"  Total Classes: {class_count}")
@@ -0,0 +1,49 @@
+import os
+import sys
+import json
+import socket
+import tempfile
+
+# Shared with dxf_daemon, the client must not import ezdxf to start fast
+SOCKET_PATH = os.path.join(tempfile.gettempdir(), f"autodxf-{os.getuid()}.sock")
+
+def request(command, *args, socket_path=SOCKET_PATH):
+    """Sends one request to the running dxf_daemon and prints its output.
+
+    Args:
+        command: 'browse', 'compare', 'recolor', 'rectangles' or 'filter'.
+        *args: Command arguments, file paths are made absolute.
+        socket_path: Unix socket the daemon listens on.
+
+    Returns:
+        True if the daemon processed the request successfully.
+    """
+    args = [os.path.abspath(arg) if isinstance(arg, str) and arg.lower().endswith('.dxf') else arg for arg in args]
+    message = json.dumps({'command': command, 'args': args}) + '\n'
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(socket_path)
+            client.sendall(message.encode('utf-8'))
+            with client.makefile('r', encoding='utf-8') as reader:
+                response = json.loads(reader.readline())
+    except (OSError, ValueError) as e:
+        print(f"Error connecting to dxf_daemon at {socket_path}: {e}")
+        return False
+
+    if response.get('ok'):
+        print(response['output'], end='')
+        return True
+    print(f"Error: {response.get('error')}")
+    return False
+
+if __name__ == "__main__":
+    # python dxf_client.py browse path/to/file.dxf
+    # python dxf_client.py compare path/to/source.dxf path/to/target.dxf
+    # python dxf_client.py recolor path/to/source.dxf path/to/target.dxf 3
+    if len(sys.argv) < 3:
+        print("Usage: dxf_client.py COMMAND PATH [ARGS...]")
+        sys.exit(2)
+
+    args = [int(arg) if arg.isdigit() else arg for arg in sys.argv[2:]]
+    sys.exit(0 if request(sys.argv[1], *args) else 1)
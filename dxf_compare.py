@@ -1,18 +1,51 @@
 import os
+import json
+import mmap
+import struct
+from collections import namedtuple
+import numpy as np
 import ezdxf
+from ezdxf.math import Vec3
+import dxf_blocks
+
+ENTITY_ATTRIBS = ['color', 'layer', 'linetype', 'start', 'end', 'insert', 'text', 'contents']
+
+# Compared attributes of one entity, "Not Specified" if the entity has no such attribute
+EntityRecord = namedtuple('EntityRecord', ['handle', 'dxftype'] + ENTITY_ATTRIBS)
+
+# Snapshot file layout, all little endian:
+#   header     magic, version, entity count, string count and the section offsets
+#   json       size, metadata, layers, blocks, styles and effective entities
+#   numbers    float64 array of the float and point values
+#   strings    uint64 offsets (string count + 1) into the UTF-8 blob
+#   blob       all strings of the entity records
+#   records    SNAPSHOT_RECORD array, one per modelspace entity, 8 byte aligned
+SNAPSHOT_MAGIC = b'DXFSNAP\x00'
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct('<8sIIQQQQQQQQ')
+
+# Kind of a stored attribute value, index holds the int itself or the
+# position in the string table or the numbers array (floats and points)
+VALUE_NONE, VALUE_INT, VALUE_BOOL, VALUE_FLOAT, VALUE_STR, VALUE_VEC3 = range(6)
+SNAPSHOT_VALUE = np.dtype([('kind', '<u1'), ('index', '<i8')])
+SNAPSHOT_RECORD = np.dtype([('handle', '<u4'), ('dxftype', '<u4')] + [(attr, SNAPSHOT_VALUE) for attr in ENTITY_ATTRIBS])
 
 def compare_dxf_files(source_path, target_path):
+    source_summary = summarize_dxf_file(source_path)
+    target_summary = summarize_dxf_file(target_path)
+    compare_dxf_summaries(source_summary, target_summary)
+
+def compare_dxf_summaries(source_summary, target_summary):
+    """Prints the comparison of two drawings from their summarize_dxf results."""
     # Compare file sizes
-    source_size = os.path.getsize(source_path)
-    target_size = os.path.getsize(target_path)
-    print(f"File Size - Source: {source_size} bytes, Target: {target_size} bytes")
+    print(f"File Size - Source: {source_summary['size']} bytes, Target: {target_summary['size']} bytes")
     
     # Analyze and report on components contributing to the file size
-    analyze_file_components(source_path, target_path)
+    analyze_file_components(source_summary, target_summary)
 
     # Compare metadata
-    source_metadata = get_dxf_metadata(source_path)
-    target_metadata = get_dxf_metadata(target_path)
+    source_metadata = source_summary['metadata']
+    target_metadata = target_summary['metadata']
 
     print("\nMetadata Comparison:")
     for key in source_metadata.keys():
@@ -21,93 +54,100 @@ def compare_dxf_files(source_path, target_path):
         print(f"{key}: Source - {source_value}, Target - {target_value}")
 
     # Compare internal entities
-    source_entities = get_dxf_entities(source_path)
-    target_entities = get_dxf_entities(target_path)
+    source_entities = source_summary['entities']
+    target_entities = target_summary['entities']
 
     print("\nEntities Count Comparison:")
     print(f"Source Entities: {len(source_entities)}, Target Entities: {len(target_entities)}")
-    print(f"Entity Differences: {set(entity.dxftype() for entity in source_entities) - set(entity.dxftype() for entity in target_entities)}")
+    print(f"Entity Differences: {set(entity.dxftype for entity in source_entities) - set(entity.dxftype for entity in target_entities)}")
 
     # Compare entity properties
     compare_entity_properties(source_entities, target_entities)
 
     # Compare layer information
-    compare_layers(source_path, target_path)
+    compare_layers(source_summary['layers'], target_summary['layers'])
 
     # Compare block definitions
-    compare_blocks(source_path, target_path)
+    compare_blocks(source_summary['blocks'], target_summary['blocks'])
+
+    # Compare effective entities with blocks expanded
+    compare_effective_entities(source_summary['effective'], target_summary['effective'])
 
     # Compare text content
     compare_text_content(source_entities, target_entities)
 
     # Compare unused styles
-    compare_unused_styles(source_path, target_path)
-
-def analyze_file_components(source_path, target_path):
-    source_entities_count = count_entities(source_path)
-    target_entities_count = count_entities(target_path)
+    compare_unused_styles(source_summary['styles'], target_summary['styles'])
 
-    source_layers_count = count_layers(source_path)
-    target_layers_count = count_layers(target_path)
-
-    source_blocks_count = count_blocks(source_path)
-    target_blocks_count = count_blocks(target_path)
+def summarize_dxf_file(filepath):
+    try:
+        dxf_doc = ezdxf.readfile(filepath)
+    except Exception as e:
+        print(f"Error reading {filepath}: {e}")
+        dxf_doc = None
+    return summarize_dxf(filepath, dxf_doc)
+
+def summarize_dxf(filepath, dxf_doc):
+    """Collects everything compared by compare_dxf_summaries from one drawing.
+
+    Args:
+        filepath: Path of the DXF file, used for the file size.
+        dxf_doc: The DXF document object, None if the file could not be read.
+    """
+    summary = {
+        'size': os.path.getsize(filepath),
+        'metadata': {},
+        'entities': [],
+        'layers': [],
+        'blocks': [],
+        'styles': [],
+        'effective': {},
+    }
+    if dxf_doc is None:
+        return summary
+
+    summary['metadata'] = get_dxf_metadata(dxf_doc)
+    summary['entities'] = get_dxf_entities(dxf_doc)
+    summary['layers'] = get_layers(dxf_doc)
+    summary['blocks'] = get_blocks(dxf_doc)
+    summary['styles'] = get_styles(dxf_doc)
+    summary['effective'] = get_effective_entities(dxf_doc)
+    return summary
+
+def analyze_file_components(source_summary, target_summary):
+    source_entities_count = len(source_summary['entities'])
+    target_entities_count = len(target_summary['entities'])
+
+    source_layers_count = len(source_summary['layers'])
+    target_layers_count = len(target_summary['layers'])
+
+    source_blocks_count = len(source_summary['blocks'])
+    target_blocks_count = len(target_summary['blocks'])
 
     print("\nFile Component Analysis:")
     print(f"Source Entities Count: {source_entities_count}, Target Entities Count: {target_entities_count}")
     print(f"Source Layers Count: {source_layers_count}, Target Layers Count: {target_layers_count}")
     print(f"Source Blocks Count: {source_blocks_count}, Target Blocks Count: {target_blocks_count}")
 
-def count_entities(filepath):
-    try:
-        dxf_doc = ezdxf.readfile(filepath)
-        return len(list(dxf_doc.modelspace().query('*')))
-    except Exception as e:
-        print(f"Error counting entities in {filepath}: {e}")
-        return 0
-
-def count_layers(filepath):
-    try:
-        dxf_doc = ezdxf.readfile(filepath)
-        return len(dxf_doc.layers)
-    except Exception as e:
-        print(f"Error counting layers in {filepath}: {e}")
-        return 0
-
-def count_blocks(filepath):
-    try:
-        dxf_doc = ezdxf.readfile(filepath)
-        return len(dxf_doc.blocks)
-    except Exception as e:
-        print(f"Error counting blocks in {filepath}: {e}")
-        return 0
-
-def get_dxf_metadata(filepath):
-    try:
-        dxf_doc = ezdxf.readfile(filepath)
-        metadata = {
-            'version': dxf_doc.dxfversion,
-            'author': dxf_doc.header.get('$AUTH', 'Not Specified'),
-            'title': dxf_doc.header.get('$TITLE', 'Not Specified'),
-            'created': dxf_doc.header.get('$TDCREATE', 'Not Specified'),
-            'updated': dxf_doc.header.get('$TDUPDATE', 'Not Specified'),
-        }
-        return metadata
-    except Exception as e:
-        print(f"Error reading metadata from {filepath}: {e}")
-        return {}
-
-def get_dxf_entities(filepath):
-    try:
-        dxf_doc = ezdxf.readfile(filepath)
-        return [entity for entity in dxf_doc.modelspace().query('*')]
-    except Exception as e:
-        print(f"Error reading entities from {filepath}: {e}")
-        return []
+def get_dxf_metadata(dxf_doc):
+    return {
+        'version': dxf_doc.dxfversion,
+        'author': dxf_doc.header.get('$AUTH', 'Not Specified'),
+        'title': dxf_doc.header.get('$TITLE', 'Not Specified'),
+        'created': dxf_doc.header.get('$TDCREATE', 'Not Specified'),
+        'updated': dxf_doc.header.get('$TDUPDATE', 'Not Specified'),
+    }
+
+def get_dxf_entities(dxf_doc):
+    """Returns an EntityRecord with the compared attributes of every modelspace entity."""
+    return [
+        EntityRecord(entity.dxf.handle, entity.dxftype(), *(getattr(entity.dxf, attr, "Not Specified") for attr in ENTITY_ATTRIBS))
+        for entity in dxf_doc.modelspace().query('*')
+    ]
 
 def compare_entity_properties(source_entities, target_entities):
-    source_entity_dict = {entity.dxf.handle: entity for entity in source_entities}
-    target_entity_dict = {entity.dxf.handle: entity for entity in target_entities}
+    source_entity_dict = {entity.handle: entity for entity in source_entities}
+    target_entity_dict = {entity.handle: entity for entity in target_entities}
 
     print("\nEntity Properties Comparison:")
     for handle, source_entity in source_entity_dict.items():
@@ -122,55 +162,55 @@ def compare_entity_properties(source_entities, target_entities):
             print(f"Entity {handle} only in target.")
 
 def compare_entity_details(source_entity, target_entity):
-    if source_entity.dxftype() != target_entity.dxftype():
-        print(f"Type mismatch for entity {source_entity.dxf.handle}: Source Type - {source_entity.dxftype()}, Target Type - {target_entity.dxftype()}")
+    if source_entity.dxftype != target_entity.dxftype:
+        print(f"Type mismatch for entity {source_entity.handle}: Source Type - {source_entity.dxftype}, Target Type - {target_entity.dxftype}")
         return
 
     differences = []
-    for attr in ['color', 'layer', 'linetype', 'start', 'end', 'insert', 'text', 'contents']:
-        source_value = getattr(source_entity.dxf, attr, "Not Specified")
-        target_value = getattr(target_entity.dxf, attr, "Not Specified")
+    for attr in ENTITY_ATTRIBS:
+        source_value = getattr(source_entity, attr)
+        target_value = getattr(target_entity, attr)
         if source_value != target_value:
             differences.append(f"{attr}: Source - {source_value}, Target - {target_value}")
 
     if differences:
-        print(f"Differences for entity {source_entity.dxf.handle}: {', '.join(differences)}")
-
-def compare_layers(source_path, target_path):
-    source_layers = get_layers(source_path)
-    target_layers = get_layers(target_path)
+        print(f"Differences for entity {source_entity.handle}: {', '.join(differences)}")
 
+def compare_layers(source_layers, target_layers):
     print("\nLayer Comparison:")
     print(f"Source Layers: {source_layers}")
     print(f"Target Layers: {target_layers}")
 
-def get_layers(filepath):
-    try:
-        dxf_doc = ezdxf.readfile(filepath)
-        return [layer.dxf.name for layer in dxf_doc.layers]
-    except Exception as e:
-        print(f"Error reading layers from {filepath}: {e}")
-        return []
-
-def compare_blocks(source_path, target_path):
-    source_blocks = get_blocks(source_path)
-    target_blocks = get_blocks(target_path)
+def get_layers(dxf_doc):
+    return [layer.dxf.name for layer in dxf_doc.layers]
 
+def compare_blocks(source_blocks, target_blocks):
     print("\nBlock Comparison:")
     print(f"Source Blocks: {source_blocks}")
     print(f"Target Blocks: {target_blocks}")
 
-def get_blocks(filepath):
-    try:
-        dxf_doc = ezdxf.readfile(filepath)
-        return [block.name for block in dxf_doc.blocks]
-    except Exception as e:
-        print(f"Error reading blocks from {filepath}: {e}")
-        return []
+def get_blocks(dxf_doc):
+    return [block.name for block in dxf_doc.blocks]
+
+def compare_effective_entities(source_layouts, target_layouts):
+    print("\nEffective Entities Comparison (Blocks Expanded):")
+    for name in list(source_layouts) + [name for name in target_layouts if name not in source_layouts]:
+        source_counts, source_extents = source_layouts.get(name, ({}, None))
+        target_counts, target_extents = target_layouts.get(name, ({}, None))
+        print(f"Layout {name}: Source Entities - {sum(source_counts.values())}, Target Entities - {sum(target_counts.values())}")
+        print(f"  Extents: Source - {dxf_blocks.format_extents(source_extents)}, Target - {dxf_blocks.format_extents(target_extents)}")
+        for dxftype in sorted(set(source_counts) | set(target_counts)):
+            source_count = source_counts.get(dxftype, 0)
+            target_count = target_counts.get(dxftype, 0)
+            if source_count != target_count:
+                print(f"  {dxftype}: Source - {source_count}, Target - {target_count}")
+
+def get_effective_entities(dxf_doc):
+    return dxf_blocks.layout_statistics(dxf_doc)
 
 def compare_text_content(source_entities, target_entities):
-    source_texts = {entity.dxf.handle: entity.dxf.text for entity in source_entities if entity.dxftype() in ['TEXT', 'MTEXT']}
-    target_texts = {entity.dxf.handle: entity.dxf.text for entity in target_entities if entity.dxftype() in ['TEXT', 'MTEXT']}
+    source_texts = {entity.handle: entity.text for entity in source_entities if entity.dxftype in ['TEXT', 'MTEXT']}
+    target_texts = {entity.handle: entity.text for entity in target_entities if entity.dxftype in ['TEXT', 'MTEXT']}
 
     print("\nText Content Comparison:")
     for handle, source_text in source_texts.items():
@@ -185,10 +225,7 @@ def compare_text_content(source_entities, target_entities):
         if handle not in source_texts:
             print(f"Text entity {handle} only in target.")
 
-def compare_unused_styles(source_path, target_path):
-    source_styles = get_styles(source_path)
-    target_styles = get_styles(target_path)
-
+def compare_unused_styles(source_styles, target_styles):
     print("\nUnused Styles Comparison:")
     unused_in_source = set(source_styles) - set(target_styles)
     unused_in_target = set(target_styles) - set(source_styles)
@@ -196,16 +233,169 @@ def compare_unused_styles(source_path, target_path):
     print(f"Unused Styles in Source: {unused_in_source}")
     print(f"Unused Styles in Target: {unused_in_target}")
 
-def get_styles(filepath):
-    try:
-        dxf_doc = ezdxf.readfile(filepath)
-        return [style.dxf.name for style in dxf_doc.styles]
-    except Exception as e:
-        print(f"Error reading styles from {filepath}: {e}")
-        return []
+def get_styles(dxf_doc):
+    return [style.dxf.name for style in dxf_doc.styles]
+
+def save_snapshot(filepath, snapshot_path):
+    """Saves the compared content of a drawing as a baseline snapshot.
+
+    Later revisions are compared against the snapshot with compare_dxf_snapshot,
+    without parsing the baseline DXF file again.
+    """
+    summary = summarize_dxf_file(filepath)
+    write_snapshot(summary, snapshot_path)
+    print(f"Snapshot of {filepath} created at: {snapshot_path}")
+
+def compare_dxf_snapshot(snapshot_path, target_path):
+    """Compares a drawing against a baseline snapshot, prints the same as compare_dxf_files."""
+    source_summary = load_snapshot(snapshot_path)
+    target_summary = summarize_dxf_file(target_path)
+    compare_dxf_summaries(source_summary, target_summary)
+
+def write_snapshot(summary, snapshot_path):
+    strings = {}
+    numbers = []
+
+    def string_index(value):
+        if value not in strings:
+            strings[value] = len(strings)
+        return strings[value]
+
+    def store_value(slot, value):
+        # bool before int, bool is a subclass of int
+        if value is None:
+            slot['kind'] = VALUE_NONE
+        elif isinstance(value, bool):
+            slot['kind'], slot['index'] = VALUE_BOOL, value
+        elif isinstance(value, int):
+            slot['kind'], slot['index'] = VALUE_INT, value
+        elif isinstance(value, float):
+            slot['kind'], slot['index'] = VALUE_FLOAT, len(numbers)
+            numbers.append(value)
+        elif isinstance(value, Vec3):
+            slot['kind'], slot['index'] = VALUE_VEC3, len(numbers)
+            numbers.extend(value)
+        else:
+            slot['kind'], slot['index'] = VALUE_STR, string_index(str(value))
+
+    entities = summary['entities']
+    records = np.zeros(len(entities), dtype=SNAPSHOT_RECORD)
+    for record, entity in zip(records, entities):
+        record['handle'] = string_index(entity.handle)
+        record['dxftype'] = string_index(entity.dxftype)
+        for attr in ENTITY_ATTRIBS:
+            store_value(record[attr], getattr(entity, attr))
+
+    numbers = np.array(numbers, dtype='<f8')
+    encoded = [string.encode('utf-8', errors='surrogatepass') for string in strings]
+    string_offsets = np.zeros(len(encoded) + 1, dtype='<u8')
+    string_offsets[1:] = np.cumsum([len(string) for string in encoded])
+    blob = b''.join(encoded)
+
+    effective = {
+        name: [counts, None if extents is None else extents.tolist()]
+        for name, (counts, extents) in summary['effective'].items()
+    }
+    document = json.dumps({
+        'size': summary['size'],
+        'metadata': summary['metadata'],
+        'layers': summary['layers'],
+        'blocks': summary['blocks'],
+        'styles': summary['styles'],
+        'effective': effective,
+    }).encode('utf-8')
+
+    json_offset = SNAPSHOT_HEADER.size
+    numbers_offset = (json_offset + len(document) + 7) // 8 * 8
+    strings_offset = numbers_offset + numbers.nbytes
+    blob_offset = strings_offset + string_offsets.nbytes
+    records_offset = (blob_offset + len(blob) + 7) // 8 * 8
+
+    with open(snapshot_path, 'wb') as fp:
+        fp.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(records), len(numbers), len(encoded),
+                                      json_offset, len(document), numbers_offset, strings_offset, blob_offset, records_offset))
+        fp.write(document)
+        fp.write(b'\x00' * (numbers_offset - json_offset - len(document)))
+        fp.write(numbers.tobytes())
+        fp.write(string_offsets.tobytes())
+        fp.write(blob)
+        fp.write(b'\x00' * (records_offset - blob_offset - len(blob)))
+        fp.write(records.tobytes())
+
+def load_snapshot(snapshot_path):
+    """Maps a snapshot file and returns a summary for compare_dxf_summaries.
+
+    The string table and entity records are not copied, they are read from
+    the memory mapped file when the comparison iterates the entities.
+    """
+    with open(snapshot_path, 'rb') as fp:
+        buffer = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if len(buffer) < SNAPSHOT_HEADER.size:
+        raise ValueError(f"Not a DXF snapshot: {snapshot_path}")
+    (magic, version, entity_count, number_count, string_count, json_offset, json_size,
+     numbers_offset, strings_offset, blob_offset, records_offset) = SNAPSHOT_HEADER.unpack_from(buffer)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError(f"Not a DXF snapshot: {snapshot_path}")
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported DXF snapshot version {version}: {snapshot_path}")
+
+    summary = json.loads(buffer[json_offset:json_offset + json_size])
+    summary['effective'] = {
+        name: (counts, None if extents is None else np.array(extents))
+        for name, (counts, extents) in summary['effective'].items()
+    }
+    numbers = np.frombuffer(buffer, dtype='<f8', count=number_count, offset=numbers_offset)
+    string_offsets = np.frombuffer(buffer, dtype='<u8', count=string_count + 1, offset=strings_offset)
+    records = np.frombuffer(buffer, dtype=SNAPSHOT_RECORD, count=entity_count, offset=records_offset)
+    summary['entities'] = SnapshotEntities(records, numbers, memoryview(buffer)[blob_offset:], string_offsets)
+    return summary
+
+class SnapshotEntities:
+    """Read-only sequence of EntityRecord decoded from the mapped snapshot records."""
+
+    def __init__(self, records, numbers, blob, string_offsets):
+        self.records = records
+        self.numbers = numbers
+        self.blob = blob
+        self.string_offsets = string_offsets.tolist()
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        for record in self.records.tolist():
+            yield self.decode(record)
+
+    def __getitem__(self, index):
+        return self.decode(self.records[index].tolist())
+
+    def string(self, index):
+        return str(self.blob[self.string_offsets[index]:self.string_offsets[index + 1]], 'utf-8', errors='surrogatepass')
+
+    def decode(self, record):
+        handle, dxftype, *values = record
+        return EntityRecord(self.string(handle), self.string(dxftype), *(self.value(*value) for value in values))
+
+    def value(self, kind, index):
+        if kind == VALUE_INT:
+            return index
+        if kind == VALUE_BOOL:
+            return bool(index)
+        if kind == VALUE_FLOAT:
+            return float(self.numbers[index])
+        if kind == VALUE_STR:
+            return self.string(index)
+        if kind == VALUE_VEC3:
+            return Vec3(self.numbers[index:index + 3])
+        return None
 
 if __name__ == "__main__":
     source_file = "/Users/smg/Documents/Programming/Code/python/sampledxf/others/now4.dxf"  # Replace with your source DXF file path
     target_file = "/Users/smg/Documents/Programming/Code/python/sampledxf/others/now4_out.dxf"  # Replace with your target DXF file path
 
     compare_dxf_files(source_file, target_file)
+
+    # Compare against an approved baseline without parsing it again:
+    #   save_snapshot(source_file, "path/to/baseline.dxfsnap")
+    #   compare_dxf_snapshot("path/to/baseline.dxfsnap", target_file)
@@ -0,0 +1,150 @@
+import os
+import io
+import json
+import signal
+import socket
+import asyncio
+import contextlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import ezdxf
+import dxf_browse
+import dxf_compare
+import dxf_filter
+import modify_annotations_color
+from dxf_client import SOCKET_PATH
+
+# Warm documents of this worker process, path -> {'signature', 'doc', 'summary', 'details'}
+document_cache = OrderedDict()
+cache_size = 8
+
+def serve(socket_path=SOCKET_PATH, cache_size=8, workers=2):
+    """Runs the daemon serving dxf_client requests until interrupted.
+
+    Parsed documents stay cached in the worker processes (LRU, keyed by path
+    and modification time), so repeated requests on the same drawing skip
+    the parsing. Requests for the same file always go to the same worker.
+
+    Args:
+        socket_path: Unix socket to listen on.
+        cache_size (int): Number of documents cached per worker.
+        workers (int): Number of worker processes.
+    """
+    if os.path.exists(socket_path):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(socket_path)
+                print(f"dxf_daemon is already running at {socket_path}")
+                return
+            except OSError:
+                # Left behind by a daemon that was killed
+                os.unlink(socket_path)
+
+    executors = [ProcessPoolExecutor(max_workers=1, initializer=init_worker, initargs=(cache_size,)) for _ in range(workers)]
+    try:
+        asyncio.run(run_server(socket_path, executors))
+    except KeyboardInterrupt:
+        print("\nStopped dxf_daemon.")
+    finally:
+        for executor in executors:
+            executor.shutdown(cancel_futures=True)
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+async def run_server(socket_path, executors):
+    async def handle(reader, writer):
+        await handle_client(reader, writer, executors)
+
+    server = await asyncio.start_unix_server(handle, path=socket_path)
+    print(f"dxf_daemon listening at {socket_path}")
+    async with server:
+        await server.serve_forever()
+
+async def handle_client(reader, writer, executors):
+    """Answers the newline delimited JSON requests of one client connection."""
+    loop = asyncio.get_running_loop()
+    try:
+        while line := await reader.readline():
+            try:
+                message = json.loads(line)
+                command = message['command']
+                args = message.get('args', [])
+                executor = executors[hash(args[0]) % len(executors)] if args else executors[0]
+                output = await loop.run_in_executor(executor, run_job, command, args)
+                response = {'ok': True, 'output': output}
+            except Exception as e:
+                response = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+            writer.write((json.dumps(response) + '\n').encode('utf-8'))
+            await writer.drain()
+    finally:
+        writer.close()
+
+def init_worker(size):
+    global cache_size
+    cache_size = size
+    # Ctrl-C reaches the whole process group, only the daemon handles it
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+def run_job(command, args):
+    """Runs one request in a worker process and returns the printed output."""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        if command == 'browse':
+            for path in args:
+                print(f"\nProcessing {path}...")
+                dxf_browse.file_metadata(path)
+                print(cached_details(path), end='')
+        elif command == 'compare':
+            source_path, target_path = args
+            dxf_compare.compare_dxf_summaries(cached_summary(source_path), cached_summary(target_path))
+        elif command == 'recolor':
+            # Streaming needs no document, it is faster than saving a cached one
+            source_path, target_path, target_color = args
+            modify_annotations_color.stream_duplicate_dxf(source_path, target_path, int(target_color))
+        elif command == 'rectangles':
+            path, = args
+            print(f"Finding all rectangle shapes in {path}.")
+            dxf_filter.print_rectangles(dxf_filter.find_rectangle_entities(cached_entry(path)['doc'].modelspace()))
+        elif command == 'filter':
+            # The document is modified, it must not stay in the cache
+            source_path, target_path = args
+            dxf_doc = cached_entry(source_path)['doc']
+            del document_cache[source_path]
+            dxf_filter.mark_rectangles(dxf_doc, target_path)
+        else:
+            raise ValueError(f"Unknown command: {command}")
+    return output.getvalue()
+
+def cached_entry(path):
+    """Returns the cache entry of a DXF file, the file is parsed only if it changed."""
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    entry = document_cache.get(path)
+    if entry is None or entry['signature'] != signature:
+        entry = {'signature': signature, 'doc': ezdxf.readfile(path), 'summary': None, 'details': None}
+        document_cache[path] = entry
+        while len(document_cache) > cache_size:
+            document_cache.popitem(last=False)
+    document_cache.move_to_end(path)
+    return entry
+
+def cached_summary(path):
+    entry = cached_entry(path)
+    if entry['summary'] is None:
+        entry['summary'] = dxf_compare.summarize_dxf(path, entry['doc'])
+    return entry['summary']
+
+def cached_details(path):
+    # The browse report depends only on the unchanged document
+    entry = cached_entry(path)
+    if entry['details'] is None:
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            dxf_browse.display_details(entry['doc'])
+        entry['details'] = output.getvalue()
+    return entry['details']
+
+if __name__ == "__main__":
+    # Start the daemon, then send requests with dxf_client:
+    #   python dxf_client.py browse path/to/file.dxf
+    serve()
@@ -2,9 +2,14 @@ import math
 from collections import defaultdict
 import ezdxf
 from ezdxf import colors
+import dxf_loader
 
 def duplicate_dxf(source_path, target_path):
     source_doc = load_dxf(source_path)
+    mark_rectangles(source_doc, target_path)
+
+def mark_rectangles(source_doc, target_path):
+    """Moves the rectangles of an already loaded document to TESTLAYER and saves it as target_path."""
     source_doc.layers.add(name="TESTLAYER", color=colors.RED)
 
     msp = source_doc.modelspace()
@@ -29,6 +34,40 @@ def load_dxf(filepath):
 
 def find_rectangles(dxf_doc):
     print("Finding all rectangle shapes in the DXF document.")
+    rectangles = find_rectangle_entities(dxf_doc.modelspace())
+
+    # Mark found rectangles
+    for rect in rectangles:
+        if isinstance(rect, list):  # Rectangles formed by LINE entities
+            for line in rect:
+                line.dxf.layer = "TESTLAYER"
+        else:  # Rectangle from LWPOLYLINE entities
+            rect.dxf.layer = "TESTLAYER"
+            
+    return rectangles  
+
+def list_rectangles(filepath):
+    """Prints the rectangles of the modelspace without loading the whole document.
+
+    Only LINE and LWPOLYLINE entities of the modelspace are read, see dxf_loader.
+    """
+    print(f"Finding all rectangle shapes in {filepath}.")
+    entities = dxf_loader.load_entities(filepath, types={'LINE', 'LWPOLYLINE'}, layouts={dxf_loader.MODELSPACE})
+    rectangles = find_rectangle_entities(entities)
+    print_rectangles(rectangles)
+    return rectangles
+
+def print_rectangles(rectangles):
+    for rect in rectangles:
+        if isinstance(rect, list):
+            print(f"  Rectangle from LINE entities: {', '.join(line.dxf.handle for line in rect)}")
+        else:
+            print(f"  Rectangle from LWPOLYLINE entity: {rect.dxf.handle}")
+    print(f"Total Rectangles: {len(rectangles)}")
+
+def find_rectangle_entities(entities):
+    """Returns the rectangles formed by LINE entities (as lists of 4 lines) and closed LWPOLYLINE entities."""
+    entities = list(entities)
     rectangles = []
     
     # Helper function to get endpoint key with tolerance
@@ -42,7 +81,7 @@ def find_rectangles(dxf_doc):
     
     # Create spatial index of line endpoints
     endpoint_to_lines = defaultdict(list)
-    lines = [entity for entity in dxf_doc.modelspace() if entity.dxftype() == 'LINE']
+    lines = [entity for entity in entities if entity.dxftype() == 'LINE']
     # Index all lines by their endpoints
     for line in lines:
         start = (line.dxf.start.x, line.dxf.start.y)
@@ -99,20 +138,12 @@ def find_rectangles(dxf_doc):
                                 processed_sets.add(rect_set)
     
     # Include closed LWPOLYLINE rectangles
-    polylines = [entity for entity in dxf_doc.modelspace() if entity.dxftype() == 'LWPOLYLINE']
+    polylines = [entity for entity in entities if entity.dxftype() == 'LWPOLYLINE']
     for polyline in polylines:
         if len(polyline) == 4 and polyline.closed:
             rectangles.append(polyline)
 
-    # Mark found rectangles
-    for rect in rectangles:
-        if isinstance(rect, list):  # Rectangles formed by LINE entities
-            for line in rect:
-                line.dxf.layer = "TESTLAYER"
-        else:  # Rectangle from LWPOLYLINE entities
-            rect.dxf.layer = "TESTLAYER"
-            
-    return rectangles  
+    return rectangles
 
 if __name__ == "__main__":
     source_file = "/Users/smg/Documents/Programming/Code/python/sampledxf/kovai/Drawing1.dxf"  # Replace with your source DXF file path
@@ -0,0 +1,198 @@
+from collections import namedtuple
+import ezdxf
+from ezdxf.lldxf.types import DXFTag
+from ezdxf.lldxf.tagger import tag_compiler
+from ezdxf.lldxf.extendedtags import ExtendedTags
+from ezdxf.entities import factory
+from ezdxf.tools.codepage import toencoding
+
+MODELSPACE = '*Model_Space'
+PAPERSPACE = '*Paper_Space'
+
+# Lightweight entity: layout is the block name the entity belongs to,
+# MODELSPACE and PAPERSPACE for the entities of the ENTITIES section
+EntityRecord = namedtuple('EntityRecord', ['dxftype', 'handle', 'layer', 'layout', 'tags'])
+
+def read_records(filepath, types=None, layouts=None, layers=None):
+    """Reads only the requested entities of a DXF file.
+
+    The tags of all other entities, tables and objects are skipped while
+    reading, no document is built. Records are yielded one at a time, so
+    the caller decides which of them stay in memory.
+
+    Args:
+        filepath: Path of the DXF file.
+        types: Entity types to load, e.g. {'LINE', 'LWPOLYLINE'}, None for all.
+        layouts: Block names to load from, e.g. {MODELSPACE}, None for all.
+        layers: Layer names to load from, None for all.
+
+    Yields:
+        EntityRecord, the tags are compiled like ezdxf does (points as DXFVertex).
+    """
+    types = upper_names(types)
+    layers = upper_names(layers)
+    if is_binary_dxf(filepath):
+        yield from read_records_from_doc(filepath, types, layouts, layers)
+        return
+
+    block_name = None
+    entity_tags = None
+
+    with open(filepath, 'rb') as fp:
+        reader = TagReader(fp)
+        for code, code_line, value_line in reader:
+            if entity_tags is not None:
+                if code != 0:
+                    entity_tags.append(DXFTag(code, value_line.rstrip(b'\r\n').decode(reader.encoding, errors='replace')))
+                    continue
+                record = make_record(entity_tags, section, block_name, layers)
+                if record is not None and (layouts is None or record.layout in layouts):
+                    yield record
+                entity_tags = None
+
+            section = reader.section
+            if section not in (b'ENTITIES', b'BLOCKS'):
+                continue
+            if code == 0:
+                dxftype = value_line.strip().decode('ascii', errors='replace')
+                if dxftype == 'BLOCK':
+                    block_name = None
+                elif dxftype in ('ENDBLK', 'ENDSEC'):
+                    pass
+                elif (types is None or dxftype in types) and (layouts is None or section == b'ENTITIES' or block_name in layouts):
+                    entity_tags = [DXFTag(0, dxftype)]
+            elif code == 2 and section == b'BLOCKS' and block_name is None:
+                block_name = value_line.rstrip(b'\r\n').decode(reader.encoding, errors='replace')
+
+        if entity_tags is not None:
+            record = make_record(entity_tags, section, block_name, layers)
+            if record is not None and (layouts is None or record.layout in layouts):
+                yield record
+
+def make_record(raw_tags, section, block_name, layers):
+    handle = None
+    layer = '0'
+    paperspace = False
+    for tag in raw_tags:
+        if tag.code == 5 and handle is None:
+            handle = tag.value
+        elif tag.code == 8:
+            layer = tag.value
+            break
+    for tag in raw_tags:
+        if tag.code == 67:
+            paperspace = tag.value.strip() == '1'
+            break
+    if layers is not None and layer.upper() not in layers:
+        return None
+
+    if section == b'ENTITIES':
+        layout = PAPERSPACE if paperspace else MODELSPACE
+    else:
+        layout = block_name
+    return EntityRecord(raw_tags[0].value, handle, layer, layout, compile_tags(raw_tags))
+
+def compile_tags(raw_tags):
+    # The compiler needs the following tag to complete the last point
+    return list(tag_compiler(iter(raw_tags + [DXFTag(0, 'EOF')])))[:-1]
+
+def upper_names(names):
+    return {name.upper() for name in names} if names is not None else None
+
+def read_records_from_doc(filepath, types=None, layouts=None, layers=None):
+    """Fallback for binary DXF files, loads the document and filters the entities.
+
+    Expects types and layers already converted by upper_names.
+    """
+    from ezdxf.lldxf.tagwriter import TagCollector
+
+    dxf_doc = ezdxf.readfile(filepath)
+    for block in dxf_doc.blocks:
+        if layouts is not None and block.name not in layouts:
+            continue
+        for entity in block:
+            if types is not None and entity.dxftype() not in types:
+                continue
+            if layers is not None and entity.dxf.layer.upper() not in layers:
+                continue
+            collector = TagCollector(dxfversion=dxf_doc.dxfversion)
+            entity.export_dxf(collector)
+            yield EntityRecord(entity.dxftype(), entity.dxf.handle, entity.dxf.layer, block.name, compile_tags(collector.tags))
+
+def load_entities(filepath, types=None, layouts=None, layers=None):
+    """Loads only the requested entities of a DXF file as ezdxf entities.
+
+    The entities are not bound to a document, use them for read-only
+    analysis, see read_records for the arguments. Each entity is built as
+    soon as its record is read, the raw tags are not kept.
+    """
+    return [factory.load(ExtendedTags(record.tags)) for record in read_records(filepath, types, layouts, layers)]
+
+class TagReader:
+    """Iterates the (code, code_line, value_line) tag pairs of an ASCII DXF file.
+
+    The iteration stops after the 0/EOF tag, anything following it (e.g. a
+    trailing newline) is left unread in the file object. Lines are passed as
+    read, including the line endings, so they can be written through unchanged.
+
+    Attributes:
+        section: Name of the section containing the current tag, e.g. b'ENTITIES'.
+        header: $ACADVER and $DWGCODEPAGE values of the HEADER section.
+        encoding: Text encoding, known from the ENDSEC tag of the HEADER section on.
+    """
+
+    def __init__(self, fp):
+        self.fp = fp
+        self.section = None
+        self.header = {}
+        self.encoding = 'cp1252'
+
+    def __iter__(self):
+        section_start = False
+        section_end = False
+        varname = None
+        lines = iter(self.fp)
+        for code_line in lines:
+            if not code_line.strip():
+                # Blank lines in place of a group code, the file has no EOF tag
+                return
+            value_line = next(lines, b'')
+            code = int(code_line)
+
+            # ENDSEC still belongs to its section
+            if section_end:
+                self.section = None
+                section_end = False
+
+            value = value_line.strip() if code == 0 else None
+            if code == 0:
+                section_start = value == b'SECTION'
+                if value == b'ENDSEC':
+                    section_end = True
+                    if self.section == b'HEADER':
+                        self.encoding = header_encoding(self.header)
+            elif code == 2 and section_start:
+                self.section = value_line.strip()
+                section_start = False
+            elif self.section == b'HEADER':
+                if code == 9:
+                    varname = value_line.strip()
+                elif varname in (b'$ACADVER', b'$DWGCODEPAGE'):
+                    self.header[varname] = value_line.strip().decode('ascii', errors='replace')
+
+            yield code, code_line, value_line
+            if value == b'EOF':
+                return
+
+def is_binary_dxf(filepath):
+    try:
+        with open(filepath, 'rb') as fp:
+            return fp.read(22) == b'AutoCAD Binary DXF\r\n\x1a\x00'
+    except IOError:
+        return False
+
+def header_encoding(header):
+    # DXF R2007 (AC1021) and later are always UTF-8 encoded
+    if header.get(b'$ACADVER', 'AC1009') >= 'AC1021':
+        return 'utf-8'
+    return toencoding(header.get(b'$DWGCODEPAGE', 'ANSI_1252'))
@@ -0,0 +1,218 @@
+import os
+import json
+import signal
+import time
+import ctypes
+import ctypes.util
+import select
+import struct
+from concurrent.futures import ProcessPoolExecutor, wait
+import dxf_browse
+import dxf_copy
+import modify_annotations_color
+
+# inotify event masks, see <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+INOTIFY_EVENT = struct.Struct('iIII')
+
+def watch(*paths, action='browse', target_color=3, output_dir=None, suffix='_out',
+          state_file='dxf_watch_state.json', workers=2, settle=2.0, poll_interval=1.0):
+    """Watches folders and processes every new or changed DXF file once it is written.
+
+    Uses inotify where available and polls the modification times otherwise.
+    A file is processed after its size and modification time did not change
+    for settle seconds, so partially written files are skipped. The processed
+    files are recorded in state_file, a restart only picks up files changed in
+    the meantime.
+
+    Args:
+        *paths: One or more folders containing DXF files.
+        action (str): 'browse', 'recolor' or 'copy'.
+        target_color (int): MTEXT color of the 'recolor' action.
+        output_dir (str): Folder of the 'recolor' and 'copy' results, defaults to the source folder.
+        suffix (str): Appended to the output file names, files with this suffix are not watched.
+        state_file (str): JSON file with the signature of every processed file.
+        workers (int): Number of worker processes.
+        settle (float): Seconds a file must stay unchanged before it is processed.
+        poll_interval (float): Seconds between two checks for changes.
+    """
+    directories = [os.path.abspath(path) for path in paths if os.path.isdir(path)]
+    for path in paths:
+        if not os.path.isdir(path):
+            print(f"Invalid path: {path}. Please provide a valid folder path.")
+    if not directories:
+        return
+
+    state = load_state(state_file)
+    pending = {}
+    running = {}
+    inotify = open_inotify(directories)
+    print(f"\nWatching {', '.join(directories)} ({'inotify' if inotify else 'polling'})...")
+
+    # Files changed while not watching
+    seen = {}
+    for directory in directories:
+        seen.update(scan_dxf_files(directory, suffix))
+    changed = set(seen)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as executor:
+        try:
+            while True:
+                now = time.monotonic()
+                for path in changed:
+                    signature = file_signature(path)
+                    if signature and signature != state.get(path) and path not in pending:
+                        pending[path] = (signature, now)
+
+                # Debounce, the signature must be stable for settle seconds
+                ready = []
+                running_paths = {path for path, signature in running.values()}
+                for path, (signature, since) in list(pending.items()):
+                    current = file_signature(path)
+                    if current is None:
+                        del pending[path]
+                    elif current != signature:
+                        pending[path] = (current, now)
+                    elif now - since >= settle and path not in running_paths:
+                        ready.append(path)
+
+                for path in ready[:workers - len(running)]:
+                    signature, since = pending.pop(path)
+                    future = executor.submit(run_action, action, path, target_color, output_dir, suffix)
+                    running[future] = (path, signature)
+
+                if running:
+                    done, _ = wait(running, timeout=0)
+                    for future in done:
+                        path, signature = running.pop(future)
+                        try:
+                            future.result()
+                            state[path] = signature
+                            save_state(state_file, state)
+                        except Exception as e:
+                            print(f"Error processing {path}: {e}")
+
+                timeout = min(poll_interval, settle / 2) if pending or running else poll_interval
+                if inotify:
+                    changed = read_inotify(*inotify, timeout)
+                else:
+                    time.sleep(timeout)
+                    changed = poll_changes(directories, suffix, seen)
+                changed = {path for path in changed if is_watched(path, suffix)}
+        except KeyboardInterrupt:
+            print("\nStopped watching.")
+        finally:
+            if inotify:
+                os.close(inotify[0])
+
+def init_worker():
+    # Ctrl-C reaches the whole process group, only the watcher handles it
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+def run_action(action, path, target_color, output_dir, suffix):
+    """Runs the configured action on one DXF file, called in a worker process."""
+    name, ext = os.path.splitext(os.path.basename(path))
+    target_path = os.path.join(output_dir or os.path.dirname(path), name + suffix + ext)
+
+    if action == 'browse':
+        dxf_browse.process_path(path)
+    elif action == 'recolor':
+        modify_annotations_color.stream_duplicate_dxf(path, target_path, target_color)
+    elif action == 'copy':
+        dxf_copy.duplicate_dxf(path, target_path)
+    else:
+        raise ValueError(f"Unknown action: {action}")
+
+def is_watched(path, suffix):
+    name, ext = os.path.splitext(os.path.basename(path))
+    return ext.lower() == '.dxf' and not (suffix and name.endswith(suffix))
+
+def file_signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+def scan_dxf_files(directory, suffix):
+    signatures = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file() and is_watched(entry.name, suffix):
+                stat = entry.stat()
+                signatures[entry.path] = [stat.st_mtime_ns, stat.st_size]
+    return signatures
+
+def poll_changes(directories, suffix, seen):
+    """Returns the DXF files changed since the last scan and updates seen."""
+    current = {}
+    for directory in directories:
+        current.update(scan_dxf_files(directory, suffix))
+    changed = {path for path, signature in current.items() if seen.get(path) != signature}
+    seen.clear()
+    seen.update(current)
+    return changed
+
+def open_inotify(directories):
+    """Returns (fd, {watch descriptor: directory}) or None if inotify is not available."""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+
+    watches = {}
+    for directory in directories:
+        wd = libc.inotify_add_watch(fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO)
+        if wd < 0:
+            os.close(fd)
+            return None
+        watches[wd] = directory
+    return fd, watches
+
+def read_inotify(fd, watches, timeout):
+    """Waits up to timeout seconds and returns the paths of the written or moved in files."""
+    readable, _, _ = select.select([fd], [], [], timeout)
+    if not readable:
+        return set()
+    try:
+        data = os.read(fd, 64 * 1024)
+    except BlockingIOError:
+        return set()
+
+    paths = set()
+    offset = 0
+    while offset + INOTIFY_EVENT.size <= len(data):
+        wd, mask, cookie, length = INOTIFY_EVENT.unpack_from(data, offset)
+        offset += INOTIFY_EVENT.size
+        name = data[offset:offset + length].rstrip(b'\0')
+        offset += length
+        if wd in watches and name:
+            paths.add(os.path.join(watches[wd], os.fsdecode(name)))
+    return paths
+
+def load_state(state_file):
+    try:
+        with open(state_file) as fp:
+            return json.load(fp)
+    except (IOError, ValueError):
+        return {}
+
+def save_state(state_file, state):
+    # Write to a temporary file first, the state survives an interrupted write
+    temp_file = state_file + '.tmp'
+    with open(temp_file, 'w') as fp:
+        json.dump(state, fp)
+    os.replace(temp_file, state_file)
+
+if __name__ == "__main__":
+    # Browse every new or changed DXF file:
+    #   watch("path/to/folder")
+    # Recolor MTEXT of new or changed DXF files into another folder:
+    #   watch("path/to/folder", action='recolor', target_color=3, output_dir="path/to/output")
+    path = "/Users/smg/Documents/Programming/Code/python/sampledxf/others/"
+
+    watch(path)
@@ -4,6 +4,9 @@ import re
 import ezdxf
 from ezdxf import colors
 from ezdxf.enums import ACI
+from ezdxf.lldxf.const import acad_release
+from ezdxf.tools.text import split_mtext_string
+from dxf_loader import TagReader, is_binary_dxf, load_entities
 
 def duplicate_dxf(source_path, target_path, target_color):
     if os.path.abspath(os.path.normpath(source_path)) == os.path.abspath(os.path.normpath(target_path)):
@@ -63,13 +66,6 @@ def list_doc(dxf_doc):
     print(f"  Encoding: {dxf_doc.encoding}")
 
 def modify_color(dxf_doc, target_color):
-    modified_count = 0
-    modified_count_embeded = 0
-    color_count = {}
-    color_count_embeded = {}
-    color_code_pattern = r'\\C(\d+);'
-    replacement = f'\\C{target_color};'
-
     def collect_mtext_from_block(block):
         """Recursively collect MText entities from a block."""
         mtext_entities = []
@@ -103,7 +99,26 @@ def modify_color(dxf_doc, target_color):
 
     # Remove duplicates
     mtext_list = list(set(mtext_list))
-    
+
+    modify_mtext_color(mtext_list, target_color)
+
+def preview_modify_color(filepath, target_color):
+    """Prints the color statistics of modify_color without loading the whole document.
+
+    Only the MTEXT entities are read, all other entities, tables and objects
+    are skipped, see dxf_loader.
+    """
+    print(f"\nProcessing {filepath}...")
+    modify_mtext_color(load_entities(filepath, types={'MTEXT'}), target_color)
+
+def modify_mtext_color(mtext_list, target_color):
+    modified_count = 0
+    modified_count_embeded = 0
+    color_count = {}
+    color_count_embeded = {}
+    color_code_pattern = r'\\C(\d+);'
+    replacement = f'\\C{target_color};'
+
     for mtext in mtext_list:
         color = mtext.dxf.color
         if color not in color_count:
@@ -125,6 +140,9 @@ def modify_color(dxf_doc, target_color):
                 mtext.text = mtext.text.replace(match.group(0), replacement)
                 modified_count_embeded += 1
 
+    print_color_statistics(color_count, color_count_embeded, modified_count, modified_count_embeded, target_color)
+
+def print_color_statistics(color_count, color_count_embeded, modified_count, modified_count_embeded, target_color):
     print("\nColor Distribution:")
     for color, count in color_count.items():
         if color == target_color:
@@ -143,6 +161,166 @@ def modify_color(dxf_doc, target_color):
 
     print(f"\nModified {modified_count_embeded} Embeded MTEXT entities")
 
+def stream_duplicate_dxf(source_path, target_path, target_color):
+    """Creates the same recolored copy as duplicate_dxf, without building the document.
+
+    The DXF tag stream is copied line by line, only MTEXT entities in the
+    ENTITIES and BLOCKS sections (modelspace, paperspace and block definitions)
+    are rewritten, so memory use does not grow with the drawing size.
+
+    Args:
+        source_path: Path of the ASCII DXF file to read.
+        target_path: Path of the recolored copy to write.
+        target_color: ACI color applied to the MTEXT entities and their \\C codes.
+    """
+    if os.path.abspath(os.path.normpath(source_path)) == os.path.abspath(os.path.normpath(target_path)):
+        print(f"Error: Source and target paths are identical")
+        return True
+
+    if is_binary_dxf(source_path):
+        # Binary DXF has no line based tag stream, use the document based path
+        return duplicate_dxf(source_path, target_path, target_color)
+
+    print(f"\nProcessing {source_path}...")
+
+    file_metadata(source_path)
+    with open(source_path, 'rb') as source, open(target_path, 'wb') as target:
+        stream_modify_color(source, target, target_color)
+
+    print(f"\nModified copy created at: {target_path}")
+
+def stream_modify_color(source, target, target_color):
+    """Copies the DXF tags from source to target and recolors MTEXT entities.
+
+    Prints the same color statistics as modify_color.
+
+    Args:
+        source: Binary file object of the DXF file to read.
+        target: Binary file object to write the tags to.
+        target_color: ACI color applied to the MTEXT entities.
+    """
+    modified_count = 0
+    modified_count_embeded = 0
+    color_count = {}
+    color_count_embeded = {}
+
+    mtext_tags = None
+
+    reader = TagReader(source)
+    for code, code_line, value_line in reader:
+        if mtext_tags is not None:
+            if code != 0:
+                mtext_tags.append((code, code_line, value_line))
+                continue
+            modified, modified_embeded = recolor_mtext_tags(mtext_tags, target_color, reader.encoding, color_count, color_count_embeded)
+            modified_count += modified
+            modified_count_embeded += modified_embeded
+            write_tags(target, mtext_tags)
+            mtext_tags = None
+
+        if code == 0:
+            value = value_line.strip()
+            if value == b'MTEXT' and reader.section in (b'ENTITIES', b'BLOCKS'):
+                mtext_tags = [(code, code_line, value_line)]
+                continue
+            if value == b'ENDSEC' and reader.section == b'HEADER':
+                list_header(reader.header, reader.encoding)
+
+        target.write(code_line)
+        target.write(value_line)
+
+    if mtext_tags is not None:
+        modified, modified_embeded = recolor_mtext_tags(mtext_tags, target_color, reader.encoding, color_count, color_count_embeded)
+        modified_count += modified
+        modified_count_embeded += modified_embeded
+        write_tags(target, mtext_tags)
+
+    # Whatever follows the EOF tag is copied unchanged
+    target.write(source.read())
+
+    print_color_statistics(color_count, color_count_embeded, modified_count, modified_count_embeded, target_color)
+
+def list_header(header, encoding):
+    version = header.get(b'$ACADVER', 'Unknown')
+    print("\ndxf Details:")
+    print(f"  DXF Version: {version}")
+    print(f"  Release: {acad_release.get(version, 'Unknown')}")
+    print(f"  Encoding: {encoding}")
+
+def recolor_mtext_tags(tags, target_color, encoding, color_count, color_count_embeded):
+    """Rewrites the color (62) and the \\C codes of the text chunks (3, 1) of one MTEXT entity in place.
+
+    Returns:
+        The number of modified colors and embeded colors.
+    """
+    modified_count = 0
+    modified_count_embeded = 0
+    color_code_pattern = r'\\C(\d+);'
+    replacement = f'\\C{target_color};'
+
+    color_index = None
+    layer_index = None
+    text_indices = []
+    for index, (code, code_line, value_line) in enumerate(tags):
+        if code == 101 or code >= 1000:
+            # Embedded object (MTEXT columns) and XDATA follow the text
+            break
+        if code == 62 and color_index is None:
+            color_index = index
+        elif code == 8 and layer_index is None:
+            layer_index = index
+        elif code in (1, 3):
+            text_indices.append(index)
+
+    newline = tags[0][2][len(tags[0][2].rstrip(b'\r\n')):]
+
+    color = int(tags[color_index][2]) if color_index is not None else 256
+    if color not in color_count:
+        color_count[color] = 0
+    color_count[color] += 1
+
+    if color != target_color:
+        color_tag = (62, tags[color_index][1] if color_index is not None else b' 62' + newline,
+                     str(target_color).encode('ascii') + newline)
+        if color_index is not None:
+            tags[color_index] = color_tag
+        else:
+            # Missing group 62 means BYLAYER, the color follows the layer
+            tags.insert(layer_index + 1 if layer_index is not None else 1, color_tag)
+            text_indices = [index + 1 for index in text_indices]
+        modified_count += 1
+
+    if not text_indices:
+        return modified_count, modified_count_embeded
+
+    text = ''.join(tags[index][2].rstrip(b'\r\n').decode(encoding, errors='surrogateescape') for index in text_indices)
+    matches = re.finditer(color_code_pattern, text, re.IGNORECASE)
+    for match in matches:
+        color_embeded = match.group(1)
+        if color_embeded not in color_count_embeded:
+            color_count_embeded[color_embeded] = 0
+        color_count_embeded[color_embeded] += 1
+
+        if match.group(1) != target_color:
+            modified_count_embeded += 1
+
+    new_text = re.sub(color_code_pattern, lambda match: replacement, text, flags=re.IGNORECASE)
+    if new_text != text:
+        chunks = split_mtext_string(new_text, size=250) or ['']
+        text_tags = [(3, b'  3' + newline, chunk.encode(encoding, errors='surrogateescape') + newline) for chunk in chunks]
+        text_tags[-1] = (1, b'  1' + newline, text_tags[-1][2])
+        first = text_indices[0]
+        for index in reversed(text_indices):
+            del tags[index]
+        tags[first:first] = text_tags
+
+    return modified_count, modified_count_embeded
+
+def write_tags(target, tags):
+    for code, code_line, value_line in tags:
+        target.write(code_line)
+        target.write(value_line)
+
 
 def main():
     # Print ACI colors
@@ -162,4 +340,6 @@ if __name__ == "__main__":
 
     target_color = 3
 
+    # Large drawings: stream the tags instead of loading the document
+    #   stream_duplicate_dxf(source_file, target_file, target_color)
     duplicate_dxf(source_file, target_file, target_color)